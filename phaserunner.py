@@ -1,20 +1,32 @@
-import exceptions
-import types
-import copy
+import fcntl
+import hashlib
+import json
+import os
 import logging
 import argparse
+import multiprocessing
+import threading
+import traceback
+import queue
 import utils
 
 LOGGER = utils.configure_log()
 
-class PhaseRunnerError(exceptions.Exception):
+#Log separators, computed once instead of per phase
+_DASH_LINE = "-" * 40
+_EQUALS_LINE = "=" * 40
+
+#CLI argument names reserved by the PhaseRunner itself (never fed into the arg pool)
+_RESERVED_ARGS = frozenset(("startwith", "endwith", "exact"))
+
+class PhaseRunnerError(Exception):
     pass
 
 class PhaseRunnerPhase(object):
     """Implementation of the individual named phase."""
-    def __init__(self, phase_name, phase_function, required_args = None, optional_args = None, outputs = None, arg_pool = None, stop_on_fail = True):
+    def __init__(self, phase_name, phase_function, required_args = None, optional_args = None, outputs = None, arg_pool = None, stop_on_fail = True, arg_lock = None):
         """Init
-     
+
         Parameters:
         phase_name (string): Name of the phase
         phase_function (function): Pointer to the class's function
@@ -23,19 +35,28 @@ class PhaseRunnerPhase(object):
         outputs (list): List of output arguments that will be produced by this runner
         arg_pool (dict): Dictionary that contains the input arguments for the runner (and will be used for output from it)
         stop_on_fail (boolean): Whether or not to stop the run after this runner fails
+        arg_lock (Lock): Lock guarding writes to the shared arg_pool when phases run concurrently
         """
         self._name = phase_name
         self._function = phase_function
         self._required_args = required_args
         self._optional_args = optional_args
+        #Validated once here so run() can do hashed membership tests instead of list scans
+        self._required_set = frozenset(required_args or ())
+        self._optional_set = frozenset(optional_args or ())
+        self._is_noarg = not self._required_set and not self._optional_set
         self._outputs = outputs
+        self._n_outputs = len(outputs) if outputs else 0
         self._arg_pool = arg_pool
         self._stop_on_fail = stop_on_fail
+        self._arg_lock = arg_lock or threading.Lock()
         self._status = None
-        
+
     @property
     def name(self): return self._name
     @property
+    def outputs(self): return self._outputs
+    @property
     def function(self): return self._function
     @property
     def required_args(self): return self._required_args
@@ -49,68 +70,127 @@ class PhaseRunnerPhase(object):
     def stop_on_fail(self): return self._stop_on_fail
     @property
     def status(self): return self._status
-    
+
+    def input_hash(self):
+        """Stable hash of this phase's resolved inputs, used to decide whether a
+           checkpoint from an earlier run is still valid."""
+        if self._arg_pool is None:
+            return hashlib.sha1(b"").hexdigest()
+        items = sorted((k, self._arg_pool[k]) for k in (self._required_set | self._optional_set) if k in self._arg_pool)
+        return hashlib.sha1(repr(items).encode("utf-8")).hexdigest()
+
+    def restore(self, outputs):
+        """Mark this phase complete from a checkpoint, re-publishing its recorded outputs
+           into the arg pool instead of re-running the function."""
+        if outputs:
+            with self._arg_lock:
+                self._arg_pool.update(outputs)
+        self._status = True
+        return self._status
+
     def run(self):
         """Execute this phase.
         
         Returns:
             The status of this execution
         """
-        #Process Arguments
-        function_args = {}
-
-        if self._arg_pool is not None:
-            #Check required arguments
-            missing_args = []
-            if self.required_args:
-                for req_arg in self.required_args:
-                    if req_arg not in self._arg_pool.keys():
-                        missing_args.append(req_arg)
-                    else:
-                        function_args[req_arg] = self._arg_pool[req_arg]
-                if len(missing_args) > 0:
-                    raise PhaseRunnerError("The following arguments are required by phase %s: %s" % (self._name, ", ".join(missing_args)))
-            #Add optional args if they've been provided
-            if self._optional_args:
-                for opt_arg in self._optional_args:
-                    if opt_arg in self._arg_pool.keys():
-                        function_args[opt_arg] = self._arg_pool[opt_arg]
-        
         #Run the function, and set output variables (if requested)
         #Note that the first value returned from all functions must be the success of the function
         #Also, if the function throws an exception, it isn't caught here (to work like any other function)
-        return_vals = self._function(**function_args)
+        if self._is_noarg:
+            #No declared args: skip pool validation and the function_args dict entirely
+            return_vals = self._function()
+        else:
+            #Process Arguments
+            function_args = {}
+            if self._arg_pool is not None:
+                #Check required arguments
+                if self._required_set:
+                    missing_args = self._required_set.difference(self._arg_pool)
+                    if missing_args:
+                        raise PhaseRunnerError(f"The following arguments are required by phase {self._name}: {', '.join(sorted(missing_args))}")
+                    function_args = {k: self._arg_pool[k] for k in self._required_set}
+                #Add optional args if they've been provided
+                if self._optional_set:
+                    function_args.update({k: self._arg_pool[k] for k in self._optional_set.intersection(self._arg_pool)})
+            return_vals = self._function(**function_args)
+        #Normalize in one pass: no return means success, a bare bool wraps, anything
+        #else must already be a (status, outputs...) sequence
         if return_vals is None:
-            return_vals = [True] #Assume passed for functions that return nothing
-        if isinstance(return_vals, types.BooleanType): #Returned only True or False
-            return_vals = [return_vals]
-            
+            return_vals = (True,)   #Assume passed for functions that return nothing
+        elif isinstance(return_vals, bool): #Returned only True or False
+            return_vals = (return_vals,)
+        else:
+            return_vals = tuple(return_vals)
+
         #Check to make sure the first item is True or False. If not, raise an error
-        if not isinstance(return_vals[0], types.BooleanType):
-            raise PhaseRunnerError("Phase %s needs to return a boolean as its first value or not return anything" % self._name)
-        
+        if not isinstance(return_vals[0], bool):
+            raise PhaseRunnerError(f"Phase {self._name} needs to return a boolean as its first value or not return anything")
+
         #The first result is whether the function passed or not. This should be "True" if it's just a utility function.
         self._status = return_vals[0]
-        
-        #Parse through outputs, raising an exception if there are too few
-        if self._outputs:
-            if len(return_vals) < (len(self._outputs) + 1):
-                raise PhaseRunnerError("Expected return values for phase %s: %s. The function only returned: %s" % (self._name, ", ".join(self._outputs), ", ".join(return_vals[1:])))
-            #With the list of "outputs", put the return value from the function into the corresponding slot in the arg pool
-            for index, rv in enumerate(self._outputs):
-                self._arg_pool[rv] = return_vals[index + 1]
-                
+
+        #Put the return values into their corresponding "outputs" slots in the arg pool,
+        #raising an exception if there are too few
+        if self._n_outputs:
+            if len(return_vals) < (self._n_outputs + 1):
+                #repr each value so a non-string return cannot raise a TypeError that masks this error
+                raise PhaseRunnerError(f"Expected return values for phase {self._name}: {', '.join(self._outputs)}. The function only returned: {', '.join(map(repr, return_vals[1:]))}")
+            #The lock keeps concurrent phases from interleaving writes to the shared pool
+            with self._arg_lock:
+                self._arg_pool.update(zip(self._outputs, return_vals[1:]))
+
         return self._status
 
+def _run_batch_task(task):
+    """Worker for PhaseRunner.run_batch. Runs one manifest entry in its own process,
+       guarded by a lockfile so concurrent or restarted batches never double-run a task."""
+    runner_cls, task_id, kwargs, output_dir, retry = task
+    task_dir = os.path.join(output_dir, task_id)
+    status_path = os.path.join(task_dir, "status.json")
+    lock_file = open(os.path.join(output_dir, task_id + ".lock"), "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        #Idempotent resume: a task that already completed is never re-run
+        if os.path.exists(status_path):
+            with open(status_path) as status_file:
+                if json.load(status_file).get("status") == "complete":
+                    return (task_id, "cached", None)
+        error = None
+        for attempt in range(retry + 1):
+            try:
+                runner = runner_cls(**kwargs)
+                if runner.run_phases() is not False:
+                    if not os.path.isdir(task_dir):
+                        os.makedirs(task_dir)
+                    with open(status_path, "w") as status_file:
+                        json.dump({"status": "complete", "outputs": runner.args}, status_file, default = repr)
+                    return (task_id, "complete", None)
+                error = "run_phases reported failure"
+            except Exception:
+                error = traceback.format_exc()
+        return (task_id, "failed", error)
+    finally:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+        lock_file.close()
+
 class PhaseRunner(object):
     """Runs a series of phases."""
     def __init__(self, *args, **kwargs):
+        #Popped (rather than get) so the checkpoint path stays out of the arg pool
+        self._checkpoint_path = kwargs.pop("checkpoint_path", None)
         self._phases = []   #List of phases
-        self._arg_pool = copy.copy(kwargs) or {}    #The argument pool should be primed with the passed keyword arguments
+        self._phase_index = {}  #Lowercased phase name -> index in self._phases, so lookups stay O(1)
+        self._phase_names = None    #Cached phase_list tuple, rebuilt lazily after add_phase
+        self._arg_pool = dict(kwargs)   #The argument pool should be primed with the passed keyword arguments
         self._stop_on_fail = kwargs.get("stop_on_fail") or True #This is the stop_on_fail for the entire runner.
                                                                 #Each phase can set its own as well
         self._first_phase = None
         self._last_phase = None
+        self._arg_lock = threading.Lock()   #Shared by all phases so concurrent output writes don't interleave
+        #Bind the optional subclass hooks once instead of a hasattr probe per run
+        self._pre_run = getattr(self, "pre_run", None)
+        self._post_run = getattr(self, "post_run", None)
         
     def add_phase(self, phase_name, phase_function, required_args = None, optional_args = None, outputs = None, *args, **kwargs):
         """Add a phase to this runner.
@@ -127,28 +207,32 @@ class PhaseRunner(object):
         if not self.phase_exists(phase_name):
             #Set stop_on_fail for the phase if provided. Otherwise, use the default from the runner
             stop_on_fail = kwargs["stop_on_fail"] if "stop_on_fail" in kwargs else self._stop_on_fail
-            self._phases.append(PhaseRunnerPhase(phase_name, phase_function, required_args, optional_args, outputs, arg_pool = self._arg_pool, stop_on_fail = stop_on_fail))
+            self._phases.append(PhaseRunnerPhase(phase_name, phase_function, required_args, optional_args, outputs, arg_pool = self._arg_pool, stop_on_fail = stop_on_fail, arg_lock = self._arg_lock))
+            self._phase_index[phase_name.lower()] = len(self._phases) - 1
+            self._phase_names = None    #Invalidate the cached name tuple
         else:
-            raise PhaseRunnerError("Phase %s already exists in runner. Cannot add more than once." % phase_name)
+            raise PhaseRunnerError(f"Phase {phase_name} already exists in runner. Cannot add more than once.")
         
     @property
     def args(self):
         return self._arg_pool
     @args.setter
     def args(self, new_args):
-        self._arg_pool.update(copy.copy(new_args))
+        self._arg_pool.update(new_args) #update() already copies the entries; no outer copy needed
     
     @property
     def phase_list(self):
-        return [p.name for p in self._phases]
+        if self._phase_names is None:
+            self._phase_names = tuple(p.name for p in self._phases)
+        return self._phase_names
 
     def phase_exists(self, phase_name):
         """Returns true if the phase name exists already"""
-        return phase_name in self.phase_list
+        return phase_name.lower() in self._phase_index
     
     def cli_setup_args(self, arg_parser):
         """Build the cli argument group for the PhaseRunner, and add it to the passed parser"""
-        phase_group = arg_parser.add_argument_group("Optional Test Phase Selection", "You can specify a start and end phase to execute. They must be in-order from the phase list.\nValid Phases: %s" % ",".join(self.phase_list))
+        phase_group = arg_parser.add_argument_group("Optional Test Phase Selection", f"You can specify a start and end phase to execute. They must be in-order from the phase list.\nValid Phases: {','.join(self.phase_list)}")
         phase_group.add_argument("--startwith", "-s", action="store", help="Specify the test phase to start with")
         phase_group.add_argument("--endwith", "-e", action="store", help="Specify the test phase to end with (inclusive)")
         phase_group.add_argument("--exact", "-x", action="store", help="The exact (and only) phase to run. Cannot be used with startswith/endswith")
@@ -160,11 +244,11 @@ class PhaseRunner(object):
         if (args.startwith or args.endwith) and args.exact:
             arg_parser.error("Both --exact and (--startwith/--endwith) cannot be used at the same time")
         if args.startwith and args.startwith not in self.phase_list:
-            arg_parser.error("Start Phase %s not in allowed phases: %s" % (args.startwith, ", ".join(self.phase_list)))
+            arg_parser.error(f"Start Phase {args.startwith} not in allowed phases: {', '.join(self.phase_list)}")
         if args.endwith and args.endwith not in self.phase_list:
-            parser.error("End Phase %s not in allowed phases: %s" % (args.endwith, ", ".join(self.phase_list)))
+            arg_parser.error(f"End Phase {args.endwith} not in allowed phases: {', '.join(self.phase_list)}")
         if args.exact and args.exact not in self.phase_list:
-            parser.error("Phase %s not in allowed phases: %s" % (args.exact, ", ".join(self.phase_list)))
+            arg_parser.error(f"Phase {args.exact} not in allowed phases: {', '.join(self.phase_list)}")
         
         #Setup phase bounds
         if args.startwith:
@@ -176,7 +260,7 @@ class PhaseRunner(object):
 
         #Create an argument dictionary by taking the argument list and removing all null
         #and PhaseRunner arguments
-        self.args = dict([(k,v) for (k,v) in args._get_kwargs() if k not in ("startwith", "endwith", "exact") and v is not None])
+        self.args = {k: v for (k, v) in args._get_kwargs() if v is not None and k not in _RESERVED_ARGS}
     
     @property
     def stop_on_fail(self): return self._stop_on_fail
@@ -184,96 +268,272 @@ class PhaseRunner(object):
     def stop_on_fail(self, value): self._stop_on_fail = value
     
     def _get_phase_index(self, phase_name):
-        index = -1
-        for temp_index, phase in enumerate(self._phases):
-            if phase.name.lower() == phase_name.lower():
-                index = temp_index
-                break
-        return index
+        return self._phase_index.get(phase_name.lower(), -1)
     
     def _get_phases(self, first_phase, last_phase):
         first_index = last_index = 0
         first_index = 0 if first_phase is None else self._get_phase_index(first_phase)
         last_index = (len(self._phases)) if last_phase is None else (self._get_phase_index(last_phase) + 1) #Using len instead of -1 because of the return of a later condition
         if first_index == -1:
-            raise exceptions.IndexError("First Phase %s not in phases" % first_phase)
+            raise IndexError(f"First Phase {first_phase} not in phases")
         if last_index == -1:
-            raise exceptions.IndexError("Last Phase %s not in phases" % last_phase)
+            raise IndexError(f"Last Phase {last_phase} not in phases")
         if last_index < first_index:
-            raise PhaseRunnerError("First Phase %s must be earlier in the phase list than Last Phase %s" % (first_phase, last_phase))
+            raise PhaseRunnerError(f"First Phase {first_phase} must be earlier in the phase list than Last Phase {last_phase}")
         return self._phases[first_index:last_index] if last_index > first_index else self._phases[first_index]
-    
-    def run_phases(self, first_phase = None, last_phase = None):
+
+    def _load_checkpoints(self):
+        """Read the checkpoint sidecar (one JSON record per line), keeping the latest
+           record per phase name. Returns {} when no checkpoint file is configured."""
+        checkpoints = {}
+        if self._checkpoint_path and os.path.exists(self._checkpoint_path):
+            with open(self._checkpoint_path) as checkpoint_file:
+                for line in checkpoint_file:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue    #Skip a partially-written trailing record
+                    checkpoints[record["name"]] = record
+        return checkpoints
+
+    def _write_checkpoint(self, phase, input_hash):
+        """Append a success record for the phase so a later run can skip it."""
+        record = {"name": phase.name,
+                  "status": phase.status,
+                  "outputs": {k: self._arg_pool[k] for k in (phase.outputs or ()) if k in self._arg_pool},
+                  "input_hash": input_hash}
+        try:
+            with open(self._checkpoint_path, "a") as checkpoint_file:
+                checkpoint_file.write(json.dumps(record) + "\n")
+        except (TypeError, ValueError):
+            LOGGER.warning("Outputs of phase %s are not JSON-serializable; checkpoint not written", phase.name)
+
+    def _build_dag(self, phases):
+        """Map each phase name to the set of names of earlier phases that produce one of
+           its required arguments. Phases with no such producers are independent and can
+           run concurrently."""
+        producers = {}  #Output arg name -> name of the phase that produces it
+        depends_on = {}
+        for phase in phases:
+            depends_on[phase.name] = set(producers[arg] for arg in (phase.required_args or ()) if arg in producers)
+            for output in (phase.outputs or ()):
+                producers[output] = phase.name
+        return depends_on
+
+    def run_phases(self, first_phase = None, last_phase = None, max_workers = 4):
         #Setup slice. Priority: function argument > instance parameter (cli) > None
         first_phase = first_phase or self._first_phase
         last_phase = last_phase or self._last_phase
         phases = self._get_phases(first_phase, last_phase)
         
         #Execute function pre_run() if it exists in class
-        if hasattr(self, "pre_run"):
+        if self._pre_run is not None:
             LOGGER.info("Running pre-run function...")
-            LOGGER.info("-" * 40)
+            LOGGER.info(_DASH_LINE)
             try:
-                success = self.pre_run()
-            except Exception, e:
-                LOGGER.error("Error in pre-run: %s" % e.message)
+                success = self._pre_run()
+            except Exception as e:
+                LOGGER.error("Error in pre-run: %s", e)
                 success = False
             if self._stop_on_fail and not success:
                 LOGGER.error("Pre-run failed and Stop_On_Fail is set. Stopping run.")
                 return False
         else:
             LOGGER.info("No pre-run. Skipping.")
-        LOGGER.info("=" * 40)
+        LOGGER.info(_EQUALS_LINE)
             
-        #Now, execute all of the phases
+        #Now, execute all of the phases. The dependency graph (built from each phase's
+        #required args and outputs) tells us which phases must wait on others; everything
+        #else is handed to a small worker pool and runs concurrently.
+        depends_on = self._build_dag(phases)
+        dependents = {}     #Phase name -> phases waiting on it
+        unsatisfied = {}    #Phase name -> count of dependencies not yet complete
         for phase in phases:
-            LOGGER.info("Running Phase %s..." % phase.name)
-            LOGGER.info("-" * 40)
-            try:
-                success = phase.run()
-            except Exception, e:
-                LOGGER.error("Error in phase '%s': %s" % (phase.name, e.message))
+            unsatisfied[phase.name] = len(depends_on[phase.name])
+            for dep in depends_on[phase.name]:
+                dependents.setdefault(dep, []).append(phase)
+
+        task_queue = queue.Queue()
+        done_queue = queue.Queue()
+        stop_event = threading.Event()  #Set when a failing phase should stop the run
+        checkpoints = self._load_checkpoints()
+        input_hashes = {}   #Phase name -> hash of the inputs it actually ran with
+        cached_names = set()    #Phases satisfied from a checkpoint (don't re-write their records)
+        fatal_errors = []   #BaseExceptions (e.g. SystemExit) to re-raise once the pool winds down
+
+        def _phase_worker():
+            while True:
+                phase = task_queue.get()
+                if phase is None:
+                    return
+                if stop_event.is_set():
+                    #The run is already stopping; report the phase back without executing it
+                    done_queue.put((phase, None))
+                    continue
+                #Input hashing only matters when checkpointing is enabled; skip the
+                #repr/sha1 work entirely otherwise
+                if self._checkpoint_path:
+                    input_hash = phase.input_hash()
+                    #A valid checkpoint with unchanged inputs means this phase already
+                    #ran to completion earlier -- restore its outputs and move on
+                    checkpoint = checkpoints.get(phase.name)
+                    if checkpoint is not None and checkpoint.get("input_hash") == input_hash:
+                        LOGGER.info("Phase %s skipping (cached)", phase.name)
+                        cached_names.add(phase.name)
+                        done_queue.put((phase, phase.restore(checkpoint.get("outputs"))))
+                        continue
+                    input_hashes[phase.name] = input_hash
+                LOGGER.info("Running Phase %s...", phase.name)
+                LOGGER.info(_DASH_LINE)
                 success = False
-            finally:
-                LOGGER.info("...Phase %s Complete" % phase.name)
+                try:
+                    success = phase.run()
+                except Exception as e:
+                    LOGGER.error("Error in phase '%s': %s", phase.name, e)
+                except BaseException as e:
+                    #SystemExit and friends aborted the whole run under the old serial
+                    #loop; stash the exception for the main thread to re-raise (the
+                    #worker keeps servicing the queue so the scheduler never starves)
+                    LOGGER.error("Fatal error in phase '%s': %s", phase.name, e)
+                    fatal_errors.append(e)
+                    stop_event.set()
+                finally:
+                    #Reported from the finally so the main thread can never block
+                    #forever waiting on a phase whose worker died mid-run
+                    LOGGER.info("...Phase %s Complete", phase.name)
+                    done_queue.put((phase, success))
+
+        workers = [threading.Thread(target = _phase_worker) for _ in range(max(1, min(len(phases), max_workers)))]
+        for worker in workers:
+            worker.daemon = True
+            worker.start()
+
+        #Seed the queue with every phase whose dependencies are already satisfied
+        submitted = 0
+        for phase in phases:
+            if unsatisfied[phase.name] == 0:
+                task_queue.put(phase)
+                submitted += 1
+
+        run_failed = False
+        finished = 0
+        while finished < submitted:
+            phase, success = done_queue.get()
+            finished += 1
+            if success is None: #Skipped because the run was already stopping
+                continue
+            if success and self._checkpoint_path and phase.name not in cached_names:
+                self._write_checkpoint(phase, input_hashes.get(phase.name))
             if not success:
                 if self._stop_on_fail and phase.stop_on_fail:
-                    LOGGER.error("Phase '%s' failed and Stop_On_Fail is set. Stopping run." % phase.name)
-                    return False
+                    LOGGER.error("Phase '%s' failed and Stop_On_Fail is set. Stopping run.", phase.name)
+                    stop_event.set()
+                    run_failed = True
                 else:
-                    LOGGER.info("Phase %s failed, but Stop_On_Fail not set (for either phase or whole runner). Run continuing." % phase.name)
-            LOGGER.info("=" * 40)
+                    LOGGER.info("Phase %s failed, but Stop_On_Fail not set (for either phase or whole runner). Run continuing.", phase.name)
+            LOGGER.info(_EQUALS_LINE)
+            #Release any phases that were only waiting on this one
+            if not stop_event.is_set():
+                for dependent in dependents.get(phase.name, ()):
+                    unsatisfied[dependent.name] -= 1
+                    if unsatisfied[dependent.name] == 0:
+                        task_queue.put(dependent)
+                        submitted += 1
+
+        for _ in workers:
+            task_queue.put(None)
+        for worker in workers:
+            worker.join()
+
+        if fatal_errors:
+            #Re-raise the first SystemExit/KeyboardInterrupt so callers see the same
+            #behavior as the old serial loop
+            raise fatal_errors[0]
+
+        if run_failed:
+            return False
 
         #Now, execute "post_run" if it exists
-        if hasattr(self, "post_run"):
+        if self._post_run is not None:
             LOGGER.info("Running post-run function...")
-            LOGGER.info("-" * 40)
+            LOGGER.info(_DASH_LINE)
             try:
-                success = self.post_run()
-            except Exception, e:
-                LOGGER.error("Error in post-run: %s" % e.message)
+                success = self._post_run()
+            except Exception as e:
+                LOGGER.error("Error in post-run: %s", e)
                 success = False
             if self._stop_on_fail and not success:
                 LOGGER.error("Post-run failed and Stop_On_Fail is set. Stopping run.")
                 return False
         else:
             LOGGER.info("No post-run. Skipping.")
-        LOGGER.info("=" * 40)
+        LOGGER.info(_EQUALS_LINE)
         
         #Finally, log the results
         LOGGER.info("Run Complete. Phase Status:")
         for phase in phases:
-            LOGGER.info("    %s: %s" % (phase.name, str(phase.status).capitalize()))
+            LOGGER.info("    %s: %s", phase.name, str(phase.status).capitalize())
+
+    def run_batch(self, manifest_path, output_dir = None, workers = None, retry = 2):
+        """Run one full phase run per manifest entry, fanned out across a process pool.
+
+        The manifest is JSON lines, one task per line: {"task_id": ..., "kwargs": {...},
+        "seed": ...}. Each worker constructs a fresh runner of this class from the task's
+        kwargs (so a subclass that adds its phases in its constructor -- the usual usage --
+        gets a complete runner) and calls run_phases(). A completed task leaves
+        <output_dir>/<task_id>/status.json behind and is skipped if the batch is re-run;
+        failed tasks are retried and, if still failing, recorded in failures.jsonl.
+
+        Returns {task_id: "complete" | "cached" | "failed"}.
+        """
+        output_dir = output_dir or (os.path.splitext(manifest_path)[0] + "_batch")
+        if not os.path.isdir(output_dir):
+            os.makedirs(output_dir)
+
+        tasks = []
+        with open(manifest_path) as manifest:
+            for line in manifest:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                kwargs = dict(record.get("kwargs") or {})
+                if "seed" in record:
+                    kwargs.setdefault("seed", record["seed"])
+                tasks.append((type(self), record["task_id"], kwargs, output_dir, retry))
+
+        results = {}
+        failures_path = os.path.join(output_dir, "failures.jsonl")
+        #Spawn (not fork) so each worker re-imports the module and configure_log starts
+        #its own queue listener; a forked child would inherit the parent's log queue with
+        #no thread draining it, silently losing every worker-side log record
+        pool = multiprocessing.get_context("spawn").Pool(workers or os.cpu_count())
+        try:
+            #imap_unordered so fast tasks aren't blocked behind slow ones
+            for task_id, outcome, error in pool.imap_unordered(_run_batch_task, tasks):
+                results[task_id] = outcome
+                if outcome == "failed":
+                    LOGGER.error("Batch task %s failed: %s", task_id, error)
+                    #Appended from the parent only, so no cross-process write races
+                    with open(failures_path, "a") as failures:
+                        failures.write(json.dumps({"task_id": task_id, "error": error}) + "\n")
+        finally:
+            pool.close()
+            pool.join()
+        return results
 
 if __name__ == '__main__':
     def a_func(number):
         LOGGER.info("A")
-        LOGGER.info("Number: %d" % number)
+        LOGGER.info("Number: %d", number)
         return True, "mystring"
     def b_func(): LOGGER.info("B")
     def c_func(a_string):
         LOGGER.info("C should fail")
-        LOGGER.info("A String: %s" % a_string)
+        LOGGER.info("A String: %s", a_string)
         return False
     def d_func():
         LOGGER.info("D")
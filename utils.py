@@ -1,14 +1,10 @@
 #/usr/local/bin python
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+import atexit
 import logging
+import logging.handlers
+import queue
 
-try:
-    from xml.etree import cElementTree as ET
-except:
-    from xml.etree import ElementTree as ET
-from xml.dom import minidom
+from xml.etree import ElementTree as ET
 
 def configure_log(level=None, name=None):
     """Configure log parameters. Borrowed from harness logmod.py to keep consistent format,
@@ -22,12 +18,36 @@ def configure_log(level=None, name=None):
     console_handler.setLevel(logging.DEBUG)
     formatter = logging.Formatter("%(asctime)s      %(levelname)s      %(message)s", "%Y:%m:%dT%H:%M:%S")
     console_handler.setFormatter(formatter)
-    lgr.addHandler(console_handler)
+
+    #Route records through a queue so callers never block on the console write()
+    #syscall; a background listener thread drains the queue to the stream. The
+    #listener is stopped (and flushed) at interpreter exit
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, console_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    lgr.addHandler(logging.handlers.QueueHandler(log_queue))
     return lgr
     
+def _indent_tree(node, level=0):
+    """Minimal stand-in for ET.indent on runtimes older than 3.9: one walk setting
+       each element's text/tail so a single tostring() serializes pretty-printed"""
+    pad = "\n" + " " * 4 * level
+    if len(node):
+        if not node.text or not node.text.strip():
+            node.text = pad + " " * 4
+        for child in node:
+            _indent_tree(child, level + 1)
+            if not child.tail or not child.tail.strip():
+                child.tail = pad + " " * 4
+        if not node[-1].tail or not node[-1].tail.strip():
+            node[-1].tail = pad
+
 def prettify_xml(node):
-    """Return a pretty-printed XML string for the pass ElementTree node"""
-    rough_string = '<?xml version="1.0" encoding="UTF-8"?>'
-    rough_string += ET.tostring(node, 'utf-8')
-    reparsed = minidom.parseString(rough_string)
-    return "\n".join([line for line in reparsed.toprettyxml(indent=' '*4).split("\n") if line.strip()])
+    """Return a pretty-printed XML string for the passed ElementTree node.
+       Indents the tree in place and serializes it once -- no minidom reparse."""
+    if hasattr(ET, "indent"):   #Python 3.9+
+        ET.indent(node, space=' ' * 4)
+    else:
+        _indent_tree(node)
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + ET.tostring(node, encoding='unicode')